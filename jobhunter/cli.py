@@ -3,33 +3,62 @@
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
 
 import click
+from rich.cells import cell_len
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from rich.markdown import Markdown
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from openai import OpenAI
-
-from .models import Profile, ApplicationStatus, WorkType
+from .models import Profile, WorkType, STATUS_BY_VALUE
 from .profile import ProfileManager, parse_resume_with_llm, extract_text_from_pdf, extract_text_from_docx
-from .scraper import JobSearchAggregator
-from .matcher import JobMatcher, CoverLetterGenerator
+from .matcher import JobMatcher, CoverLetterGenerator, DEFAULT_MATCH_MODEL, DEFAULT_COVER_MODEL
+from .llm_cache import LLMCache
+from . import prefilter
 from .tracker import ApplicationTracker
 
 
 console = Console()
 
+_STATUS_CHOICES = list(STATUS_BY_VALUE)
+
+
+def _add_columns(table: Table, columns: list[tuple[str, str]], rows: list) -> None:
+    """Add (header, style) columns sized to the plain-text rows they will hold.
+    
+    When the table fits the terminal, explicit widths let Rich skip measuring
+    every cell; otherwise Rich is left to wrap and shrink columns itself.
+    """
+    widths = [
+        max([cell_len(header), *(cell_len(row[col]) for row in rows)])
+        for col, (header, _) in enumerate(columns)
+    ]
+    # Each column also takes two padding cells and a border
+    fits = sum(widths) + 3 * len(widths) + 1 <= console.width
+    
+    for (header, style), width in zip(columns, widths):
+        table.add_column(header, style=style, width=width if fits else None)
+
 
+@lru_cache(maxsize=1)
 def get_client():
-    """Get OpenAI client."""
+    """Get the shared OpenAI client.
+    
+    Cached so every matcher and generator in the process reuses one
+    connection pool instead of opening new TLS connections.
+    """
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         console.print("[red]Error: OPENAI_API_KEY environment variable not set[/red]")
         sys.exit(1)
+    
+    # Deferred: importing openai dominates CLI startup time
+    from openai import OpenAI
     return OpenAI(api_key=api_key)
 
 
@@ -66,14 +95,8 @@ def profile_setup():
     location = click.prompt("Location (e.g., Dublin, Ireland)")
     
     # Summary
-    console.print("\n[dim]Write a brief professional summary (press Enter twice to finish):[/dim]")
-    summary_lines = []
-    while True:
-        line = input()
-        if line == "":
-            break
-        summary_lines.append(line)
-    summary = " ".join(summary_lines) if summary_lines else None
+    console.print("\n[dim]Opening your editor for a brief professional summary (save and close when done)...[/dim]")
+    summary = (click.edit() or "").strip() or None
     
     # Skills
     skills_input = click.prompt("\nSkills (comma-separated)", default="")
@@ -185,8 +208,9 @@ def profile_show():
         for exp in user_profile.experience:
             console.print(f"  • {exp.title} at {exp.company}")
     
-    if user_profile.get_all_skills():
-        console.print(f"\n[bold]Skills:[/bold] {', '.join(user_profile.get_all_skills())}")
+    all_skills = user_profile.get_all_skills()
+    if all_skills:
+        console.print(f"\n[bold]Skills:[/bold] {', '.join(all_skills)}")
     
     if user_profile.target_roles:
         console.print(f"\n[bold]Target Roles:[/bold] {', '.join(user_profile.target_roles)}")
@@ -200,7 +224,8 @@ def profile_show():
 @click.option("--remote", "-r", is_flag=True, help="Remote jobs only")
 @click.option("--limit", "-n", default=20, help="Maximum results")
 @click.option("--score", "-s", is_flag=True, help="Score jobs against your profile")
-def search(query, location, remote, limit, score):
+@click.option("--match-model", default=DEFAULT_MATCH_MODEL, show_default=True, help="Model used for scoring")
+def search(query, location, remote, limit, score, match_model):
     """Search for jobs."""
     manager = ProfileManager()
     user_profile = manager.load()
@@ -209,6 +234,8 @@ def search(query, location, remote, limit, score):
         console.print("[yellow]No profile found. Run 'jobhunter profile setup' first to enable scoring.[/yellow]")
         score = False
     
+    from .scraper import JobSearchAggregator
+    
     aggregator = JobSearchAggregator()
     
     with Progress(
@@ -228,7 +255,7 @@ def search(query, location, remote, limit, score):
         if score and jobs and user_profile:
             progress.update(task, description=f"Scoring {len(jobs)} jobs...")
             client = get_client()
-            matcher = JobMatcher(client)
+            matcher = JobMatcher(client, model=match_model, cache=LLMCache())
             jobs = matcher.score_jobs(jobs[:limit], user_profile)
     
     if not jobs:
@@ -238,16 +265,7 @@ def search(query, location, remote, limit, score):
     console.print(f"\n[green]Found {len(jobs)} jobs[/green]\n")
     
     # Display results
-    table = Table(title=f"Jobs matching '{query}'")
-    table.add_column("#", style="dim")
-    table.add_column("Title", style="bold")
-    table.add_column("Company", style="cyan")
-    table.add_column("Location")
-    if score:
-        table.add_column("Match", style="green")
-    table.add_column("Source", style="dim")
-    
-    for i, job in enumerate(jobs[:limit], 1):
+    def job_row(i, job):
         row = [
             str(i),
             job.title[:40],
@@ -258,6 +276,19 @@ def search(query, location, remote, limit, score):
             score_str = f"{job.match_score}%" if job.match_score else "-"
             row.append(score_str)
         row.append(job.source)
+        return row
+    
+    rows = [job_row(i, job) for i, job in enumerate(jobs[:limit], 1)]
+    
+    columns = [("#", "dim"), ("Title", "bold"), ("Company", "cyan"), ("Location", "")]
+    if score:
+        columns.append(("Match", "green"))
+    columns.append(("Source", "dim"))
+    
+    table = Table(title=f"Jobs matching '{query}'")
+    _add_columns(table, columns, rows)
+    
+    for row in rows:
         table.add_row(*row)
     
     console.print(table)
@@ -273,7 +304,9 @@ def search(query, location, remote, limit, score):
 
 @cli.command("recommend")
 @click.option("--limit", "-n", default=10, help="Number of recommendations")
-def recommend(limit):
+@click.option("--match-model", default=DEFAULT_MATCH_MODEL, show_default=True, help="Model used for scoring")
+@click.option("--shortlist", default=15, show_default=True, help="Jobs to score with AI after local keyword ranking (0 to score all)")
+def recommend(limit, match_model, shortlist):
     """Get job recommendations based on your profile."""
     manager = ProfileManager()
     user_profile = manager.load()
@@ -286,28 +319,41 @@ def recommend(limit):
         console.print("[yellow]No target roles set. Update your profile with target job titles.[/yellow]")
         return
     
-    aggregator = JobSearchAggregator()
+    from .scraper import JobSearchAggregator
+    
     client = get_client()
-    matcher = JobMatcher(client)
+    matcher = JobMatcher(client, model=match_model, cache=LLMCache())
     
-    all_jobs = []
+    roles = user_profile.target_roles[:3]
+    
+    def search_role(role):
+        # Each thread gets its own aggregator so scrapers don't share a session
+        return JobSearchAggregator().search(
+            query=role,
+            location=user_profile.location or "",
+            max_per_source=10
+        )
     
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         console=console,
     ) as progress:
-        # Search for each target role
-        for role in user_profile.target_roles[:3]:
-            task = progress.add_task(f"Searching for '{role}'...", total=None)
-            
-            jobs = aggregator.search(
-                query=role,
-                location=user_profile.location or "",
-                max_per_source=10
-            )
-            all_jobs.extend(jobs)
-            progress.remove_task(task)
+        # Search all target roles at once; each search is network-bound
+        task = progress.add_task(f"Searching {len(roles)} roles in parallel...", total=None)
+        with ThreadPoolExecutor(max_workers=len(roles)) as executor:
+            all_jobs = list(chain.from_iterable(executor.map(search_role, roles)))
+        progress.remove_task(task)
+        
+        # The same posting often comes back for several roles; score it once
+        unique_jobs = {}
+        for job in all_jobs:
+            unique_jobs.setdefault(job.url or (job.company, job.title), job)
+        all_jobs = list(unique_jobs.values())
+        
+        # Rank locally by keyword overlap and only send the best to the AI
+        if shortlist:
+            all_jobs = prefilter.shortlist(all_jobs, user_profile, top_m=max(shortlist, limit))
         
         # Score all jobs
         task = progress.add_task(f"Analyzing {len(all_jobs)} jobs...", total=None)
@@ -339,7 +385,11 @@ def recommend(limit):
 @click.option("--tone", "-t", default="professional", type=click.Choice(["professional", "casual", "enthusiastic"]))
 @click.option("--length", "-l", default="medium", type=click.Choice(["short", "medium", "long"]))
 @click.option("--output", "-o", help="Output file path")
-def cover(job_url, tone, length, output):
+@click.option("--no-cache", is_flag=True, help="Always write a fresh letter instead of reusing a cached one")
+@click.option("--stream/--no-stream", default=True, help="Show the letter as it is written, or analyze and write it in one API call")
+@click.option("--match-model", default=DEFAULT_MATCH_MODEL, show_default=True, help="Model used for job analysis when streaming")
+@click.option("--cover-model", default=DEFAULT_COVER_MODEL, show_default=True, help="Model used to write the letter")
+def cover(job_url, tone, length, output, no_cache, stream, match_model, cover_model):
     """Generate a cover letter for a job."""
     manager = ProfileManager()
     user_profile = manager.load()
@@ -352,22 +402,20 @@ def cover(job_url, tone, length, output):
     # In full implementation, would scrape the job details
     from .models import Job
     import hashlib
+    from rich.live import Live
+    from rich.markdown import Markdown
     
-    job_id = hashlib.md5(job_url.encode()).hexdigest()[:8]
+    job_id = hashlib.blake2b(job_url.encode(), digest_size=4).hexdigest()
     
     console.print("[dim]Note: Paste the job description when prompted for best results.[/dim]")
-    console.print("\n[bold]Paste the job description (press Enter twice when done):[/bold]")
-    
-    description_lines = []
-    while True:
-        line = input()
-        if line == "":
-            if description_lines:
-                break
-        else:
-            description_lines.append(line)
+    console.print("\n[bold]Paste the job description, then press Ctrl-D (Ctrl-Z Enter on Windows):[/bold]")
     
-    description = "\n".join(description_lines)
+    # One block read instead of a Python loop per line; also works with a pipe
+    description = sys.stdin.read().strip()
+    
+    if not description:
+        console.print("[red]No job description provided.[/red]")
+        return
     
     # Extract title and company (simple heuristics)
     lines = description.split("\n")
@@ -385,33 +433,59 @@ def cover(job_url, tone, length, output):
     )
     
     client = get_client()
-    
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
-        # First score the job to get skill analysis
-        task = progress.add_task("Analyzing job match...", total=None)
-        matcher = JobMatcher(client)
-        job = matcher.score_job(job, user_profile)
+    cache = None if no_cache else LLMCache()
+    generator = CoverLetterGenerator(client, model=cover_model, cache=cache)
+    
+    if stream:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+        ) as progress:
+            # First score the job to get skill analysis
+            task = progress.add_task("Analyzing job match...", total=None)
+            matcher = JobMatcher(client, model=match_model, cache=cache)
+            job = matcher.score_job(job, user_profile)
         
-        # Generate cover letter
-        progress.update(task, description="Writing cover letter...")
-        generator = CoverLetterGenerator(client)
-        letter = generator.generate(job, user_profile, tone=tone, length=length)
-    
-    console.print("\n" + "="*60 + "\n")
-    console.print(Markdown(letter))
-    console.print("\n" + "="*60)
+        # Stream the letter so it appears as soon as the first tokens arrive
+        console.print("\n" + "="*60 + "\n")
+        letter = ""
+        with Live(Markdown(letter), console=console, refresh_per_second=8) as live:
+            for text in generator.generate_stream(job, user_profile, tone=tone, length=length):
+                letter += text
+                live.update(Markdown(letter))
+        console.print("\n" + "="*60)
+    else:
+        # Already loaded by get_client(), so this import is free
+        from openai import LengthFinishReasonError
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+        ) as progress:
+            # One round-trip: the match analysis and the letter come back together
+            task = progress.add_task("Analyzing job and writing cover letter...", total=None)
+            try:
+                letter = generator.analyze_and_write(job, user_profile, tone=tone, length=length)
+            except LengthFinishReasonError:
+                # The combined answer overran its budget; score and write separately
+                progress.update(task, description="Letter ran long, retrying as two requests...")
+                matcher = JobMatcher(client, model=match_model, cache=cache)
+                job = matcher.score_job(job, user_profile)
+                letter = generator.generate(job, user_profile, tone=tone, length=length)
+        
+        console.print("\n" + "="*60 + "\n")
+        console.print(Markdown(letter))
+        console.print("\n" + "="*60)
     
     # Save if output specified
     if output:
         with open(output, "w") as f:
             f.write(letter)
         console.print(f"\n[green]✓ Saved to {output}[/green]")
-    else:
-        # Offer to save
+    elif sys.stdin.isatty():
+        # Offer to save (stdin is spent when the description was piped in)
         if click.confirm("\nSave cover letter?"):
             default_name = f"cover_letter_{job_id}.md"
             filename = click.prompt("Filename", default=default_name)
@@ -429,25 +503,18 @@ def track():
 
 
 @track.command("list")
-@click.option("--status", "-s", type=click.Choice([s.value for s in ApplicationStatus]), help="Filter by status")
+@click.option("--status", "-s", type=click.Choice(_STATUS_CHOICES), help="Filter by status")
 def track_list(status):
     """List all tracked applications."""
     tracker = ApplicationTracker()
     
-    status_filter = ApplicationStatus(status) if status else None
+    status_filter = STATUS_BY_VALUE[status] if status else None
     applications = tracker.list_all(status_filter)
     
     if not applications:
         console.print("[dim]No applications tracked yet.[/dim]")
         return
     
-    table = Table(title="Your Applications")
-    table.add_column("ID", style="dim")
-    table.add_column("Company", style="cyan")
-    table.add_column("Title")
-    table.add_column("Status")
-    table.add_column("Updated")
-    
     status_colors = {
         "saved": "dim",
         "applied": "blue",
@@ -458,14 +525,24 @@ def track_list(status):
         "withdrawn": "dim",
     }
     
-    for app in applications:
-        status_style = status_colors.get(app["status"], "")
+    rows = [
+        (app["id"], app["company"][:20], app["title"][:30], app["status"], app["updated_at"][:10])
+        for app in applications
+    ]
+    
+    table = Table(title="Your Applications")
+    _add_columns(table, [
+        ("ID", "dim"), ("Company", "cyan"), ("Title", ""), ("Status", ""), ("Updated", "")
+    ], rows)
+    
+    for app_id, company, title, status_value, updated in rows:
+        status_style = status_colors.get(status_value, "")
         table.add_row(
-            app["id"],
-            app["company"][:20],
-            app["title"][:30],
-            f"[{status_style}]{app['status']}[/{status_style}]",
-            app["updated_at"][:10],
+            app_id,
+            company,
+            title,
+            f"[{status_style}]{status_value}[/{status_style}]",
+            updated,
         )
     
     console.print(table)
@@ -479,7 +556,7 @@ def track_list(status):
 @track.command("add")
 @click.argument("company")
 @click.argument("title")
-@click.option("--status", "-s", default="applied", type=click.Choice([s.value for s in ApplicationStatus]))
+@click.option("--status", "-s", default="applied", type=click.Choice(_STATUS_CHOICES))
 @click.option("--url", "-u", default="", help="Job posting URL")
 def track_add(company, title, status, url):
     """Add a new application to track."""
@@ -497,7 +574,7 @@ def track_add(company, title, status, url):
     )
     
     tracker = ApplicationTracker()
-    application = tracker.add(job, ApplicationStatus(status))
+    application = tracker.add(job, STATUS_BY_VALUE[status])
     
     console.print(f"[green]✓ Added application: {title} @ {company}[/green]")
     console.print(f"[dim]ID: {application.id}[/dim]")
@@ -505,14 +582,13 @@ def track_add(company, title, status, url):
 
 @track.command("update")
 @click.argument("app_id")
-@click.argument("new_status", type=click.Choice([s.value for s in ApplicationStatus]))
+@click.argument("new_status", type=click.Choice(_STATUS_CHOICES))
 @click.option("--notes", "-n", default="", help="Notes about the update")
 def track_update(app_id, new_status, notes):
     """Update application status."""
     tracker = ApplicationTracker()
-    application = tracker.update_status(app_id, ApplicationStatus(new_status), notes)
     
-    if application:
+    if tracker.set_status(app_id, STATUS_BY_VALUE[new_status], notes):
         console.print(f"[green]✓ Updated {app_id} to '{new_status}'[/green]")
     else:
         console.print(f"[red]Application {app_id} not found[/red]")
@@ -0,0 +1,77 @@
+"""On-disk cache for LLM results."""
+
+import copy
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+from . import jsonutil
+
+
+class LLMCache:
+    """Content-addressed cache of LLM results.
+
+    Each entry is stored as a JSON file named after its key under
+    ``cache_dir``. The most recently used entries are also kept in memory
+    so repeated lookups in one process skip the disk entirely.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_memory_entries: int = 512):
+        self.cache_dir = cache_dir or Path.home() / ".jobhunter" / "cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_memory_entries = max_memory_entries
+        self._memory: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a cache key from the inputs that determine a result."""
+        content = "\x00".join(parts)
+        return hashlib.blake2b(content.encode(), digest_size=32).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for a key, or None on a miss."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                # Callers get their own copy, so editing a result can't change the cache
+                return copy.deepcopy(self._memory[key])
+
+        try:
+            with open(self._path(key), "rb") as f:
+                value = jsonutil.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+        self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value, replacing the file atomically."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            # JSON is UTF-8 whatever the locale; get() reads it back as bytes
+            with os.fdopen(fd, "wb") as f:
+                f.write(jsonutil.dumps(value).encode("utf-8"))
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        self._remember(key, value)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _remember(self, key: str, value: Any) -> None:
+        """Add a private copy of an entry to the in-memory LRU."""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
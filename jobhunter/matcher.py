@@ -1,24 +1,233 @@
 """AI-powered job matching engine."""
 
-import json
-from typing import Optional
-
-from openai import OpenAI
+import html
+import logging
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterator, Optional
 
+from .llm_cache import LLMCache
 from .models import Job, Profile
+from .prefilter import tokenize
+
+if TYPE_CHECKING:
+    # Imported lazily at runtime; openai is by far the slowest import in the package
+    from openai import OpenAI
+
+log = logging.getLogger(__name__)
+
+
+# Scoring is a short structured task, so it defaults to the cheaper, faster tier
+DEFAULT_MATCH_MODEL = "gpt-4o-mini"
+DEFAULT_COVER_MODEL = "gpt-4o"
+
+# Bump when a prompt changes so cached results from the old prompt are ignored
+PROMPT_VERSION = "2"
+
+# Output budget for one match analysis; the trimmed schema fits well inside it
+MATCH_MAX_TOKENS = 350
+
+# Scoring runs many requests back to back, so it rides out rate limits longer
+# than the SDK default of 2 retries before a job falls back to a score of 0
+MATCH_MAX_RETRIES = 5
+
+# Tags that end a block of text; they become line breaks so that list items
+# and headings stay separate from the sentences around them
+_BLOCK_TAG_RE = re.compile(r"</?(?:p|div|li|ul|ol|h[1-6]|br|tr|section|article)\b[^>]*>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+_BULLET_RE = re.compile(r"[\u2022\u25cf\u25aa\u25e6\u25a0\u25ba\u2713\u2714]")
+_SPACE_RE = re.compile(r"[^\S\n]+")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+# Legal/HR boilerplate that says nothing about the role itself. Only the
+# sentence or line containing one of these phrases is dropped.
+_BOILERPLATE_RE = re.compile(
+    r"\b(?:equal (?:employment )?opportunit(?:y|ies)"
+    r"|sexual orientation|gender identity|national origin|veteran status"
+    r"|reasonable accommodations?)\b",
+    re.IGNORECASE,
+)
+
+# Markup and boilerplate inflate raw descriptions, so keep a few times the
+# token budget before cleaning; anything past that would be truncated anyway
+_RAW_CHARS_PER_TOKEN = 16
+
+
+# Rough characters per token, used when tiktoken is unavailable
+_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the gpt-4o tokenizer once, or return None if tiktoken can't provide it."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # Not installed, or the encoding file can't be downloaded
+        return None
+
+
+def _truncate_tokens(text: str, max_tokens: int) -> str:
+    """Truncate text to at most max_tokens model tokens."""
+    # Every token covers at least one character, so short text always fits
+    if len(text) <= max_tokens:
+        return text
+    
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:max_tokens * _CHARS_PER_TOKEN]
+    
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+def _normalize_description(text: str, max_tokens: int = 300) -> str:
+    """Strip markup, bullets and boilerplate from a job description and truncate it."""
+    text = html.unescape(text[:max_tokens * _RAW_CHARS_PER_TOKEN])
+    text = _BLOCK_TAG_RE.sub("\n", text)
+    text = _TAG_RE.sub(" ", text)
+    text = _BULLET_RE.sub(" ", text)
+    
+    lines = []
+    for line in text.splitlines():
+        sentences = [
+            sentence for sentence in _SENTENCE_END_RE.split(_SPACE_RE.sub(" ", line).strip())
+            if sentence and not _BOILERPLATE_RE.search(sentence)
+        ]
+        if sentences:
+            lines.append(" ".join(sentences))
+    
+    return _truncate_tokens("\n".join(lines), max_tokens)
+
+
+def _rank_skills(skills: list[str], text: str, top_k: int = 15) -> list[str]:
+    """Return the top_k skills that appear most often in text."""
+    counts = Counter(tokenize(text))
+    
+    def relevance(skill: str) -> float:
+        tokens = tokenize(skill)
+        return sum(counts[t] for t in tokens) / len(tokens) if tokens else 0
+    
+    # sorted() is stable, so ties keep their original order
+    return sorted(skills, key=relevance, reverse=True)[:top_k]
+
+
+MATCH_SCHEMA = """{
+    "score": <0-100 integer, how well the candidate matches>,
+    "summary": "<2-3 sentence summary of the match>",
+    "matching_skills": ["skill1", "skill2", ...],
+    "skill_gaps": ["missing skill 1", "missing skill 2", ...],
+    "required_skills": ["skills mentioned in job description"]
+}"""
+
+SCORING_GUIDE = """Scoring guide:
+- 90-100: Excellent match, meets nearly all requirements
+- 80-89: Strong match, meets most requirements
+- 70-79: Good match, meets core requirements
+- 60-69: Moderate match, meets some requirements
+- 50-59: Weak match, significant gaps
+- Below 50: Poor match, major misalignment
+
+Be realistic but fair. Consider transferable skills."""
+
+MATCH_SYSTEM_PROMPT = f"""You are a job matching expert. Analyze how well a candidate matches a job.
+
+Return a JSON object with:
+{MATCH_SCHEMA}
+
+{SCORING_GUIDE}"""
+
+BATCH_MATCH_SYSTEM_PROMPT = f"""You are a job matching expert. Analyze how well a candidate matches each of several jobs.
+
+The jobs are numbered "=== JOB 1 ===", "=== JOB 2 ===", etc. Analyze every job independently.
+
+Return a JSON object with a "results" array holding one entry per job:
+{{
+    "results": [
+        {{"index": <job number>, ...analysis fields...}}
+    ]
+}}
+
+Each analysis has the fields:
+{MATCH_SCHEMA}
+
+{SCORING_GUIDE}"""
+
+ANALYZE_AND_WRITE_INSTRUCTIONS = f"""
+
+Before writing, analyze how well the candidate matches the job.
+
+Return a JSON object with:
+{{
+    "analysis": {MATCH_SCHEMA},
+    "cover_letter": "<the complete cover letter in Markdown>"
+}}
+
+{SCORING_GUIDE}"""
+
+
+def _parsed_output(response):
+    """Return the schema-validated output of a structured response."""
+    message = response.choices[0].message
+    if message.parsed is None:
+        raise ValueError(f"Model refused the request: {message.refusal}")
+    return message.parsed
+
+
+def _apply_analysis(job: Job, analysis: dict) -> Job:
+    """Copy match analysis fields onto a job."""
+    job.match_score = analysis.get("score", 0)
+    job.match_analysis = analysis.get("summary", "")
+    job.skill_matches = analysis.get("matching_skills", [])
+    job.skill_gaps = analysis.get("skill_gaps", [])
+    
+    # Extract skills from description if not already done
+    if not job.required_skills and analysis.get("required_skills"):
+        job.required_skills = analysis["required_skills"]
+    
+    return job
 
 
 class JobMatcher:
     """Matches jobs to user profile using AI."""
     
-    def __init__(self, client: Optional[OpenAI] = None):
-        self.client = client or OpenAI()
+    def __init__(
+        self,
+        client: Optional["OpenAI"] = None,
+        model: str = DEFAULT_MATCH_MODEL,
+        cache: Optional[LLMCache] = None,
+        max_retries: int = MATCH_MAX_RETRIES
+    ):
+        if client is None:
+            from openai import OpenAI
+            client = OpenAI()
+        # The SDK retries rate limits, 5xx and connection errors with jittered
+        # exponential backoff (honouring Retry-After) but not 400/401 errors.
+        # The copy shares the original client's connection pool.
+        self.client = client.with_options(max_retries=max_retries)
+        self.model = model
+        self.cache = cache
     
-    def score_job(self, job: Job, profile: Profile) -> Job:
-        """Score a job against a profile and add analysis."""
+    def score_job(
+        self,
+        job: Job,
+        profile: Profile,
+        profile_summary: Optional[str] = None
+    ) -> Job:
+        """Score a job against a profile and add analysis.
+        
+        Pass ``profile_summary`` when scoring many jobs for the same profile
+        to avoid rebuilding it for each one.
+        """
         
         # Build profile summary for matching
-        profile_summary = self._build_profile_summary(profile)
+        if profile_summary is None:
+            profile_summary = self._build_profile_summary(profile)
         
         # Build job summary
         job_summary = self._build_job_summary(job)
@@ -26,35 +235,67 @@ class JobMatcher:
         # Get AI analysis
         analysis = self._analyze_match(profile_summary, job_summary)
         
-        # Update job with match data
-        job.match_score = analysis.get("score", 0)
-        job.match_analysis = analysis.get("summary", "")
-        job.skill_matches = analysis.get("matching_skills", [])
-        job.skill_gaps = analysis.get("skill_gaps", [])
+        return _apply_analysis(job, analysis)
+    
+    def score_jobs(
+        self,
+        jobs: list[Job],
+        profile: Profile,
+        batch_size: int = 8,
+        max_concurrency: int = 4
+    ) -> list[Job]:
+        """Score multiple jobs and sort by match.
+        
+        Jobs are packed ``batch_size`` at a time into a single API call,
+        so N jobs cost about N / batch_size round-trips instead of N. Up to
+        ``max_concurrency`` batches are in flight at once.
+        """
+        profile_summary = self._build_profile_summary(profile)
+        
+        batches = [jobs[i:i + batch_size] for i in range(0, len(jobs), batch_size)]
         
-        # Extract skills from description if not already done
-        if not job.required_skills and analysis.get("required_skills"):
-            job.required_skills = analysis["required_skills"]
+        # The OpenAI client is thread-safe, so batches share one connection pool
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = [
+                executor.submit(self._score_batch, batch, profile_summary)
+                for batch in batches
+            ]
+            for future in futures:
+                future.result()
+        
+        # Sort by match score descending
+        jobs = sorted(jobs, key=lambda j: j.match_score or 0, reverse=True)
         
-        return job
+        return jobs
     
-    def score_jobs(self, jobs: list[Job], profile: Profile) -> list[Job]:
-        """Score multiple jobs and sort by match."""
-        scored_jobs = []
+    def _score_batch(self, batch: list[Job], profile_summary: str) -> None:
+        """Score one batch of jobs in place."""
+        job_summaries = [self._build_job_summary(job) for job in batch]
+        keys = [self._cache_key(profile_summary, summary) for summary in job_summaries]
         
-        for job in jobs:
+        analyses = [self._cache_get(key) for key in keys]
+        misses = [i for i, analysis in enumerate(analyses) if analysis is None]
+        
+        if misses:
+            try:
+                fresh = self._analyze_matches_batch(
+                    profile_summary, [job_summaries[i] for i in misses]
+                )
+            except Exception as e:
+                log.warning("Error scoring batch of %d jobs: %s", len(misses), e)
+                fresh = [{} for _ in misses]
+            
+            for i, analysis in zip(misses, fresh):
+                analyses[i] = analysis
+                if analysis:
+                    self._cache_put(keys[i], analysis)
+        
+        for i, job in enumerate(batch):
             try:
-                scored_job = self.score_job(job, profile)
-                scored_jobs.append(scored_job)
+                _apply_analysis(job, analyses[i])
             except Exception as e:
-                print(f"Error scoring job {job.title}: {e}")
+                log.warning("Error scoring job %s: %s", job.title, e)
                 job.match_score = 0
-                scored_jobs.append(job)
-        
-        # Sort by match score descending
-        scored_jobs.sort(key=lambda j: j.match_score or 0, reverse=True)
-        
-        return scored_jobs
     
     def _build_profile_summary(self, profile: Profile) -> str:
         """Build a text summary of the profile."""
@@ -117,55 +358,95 @@ class JobMatcher:
             parts.append(f"Level: {job.experience_level}")
         
         if job.description:
-            parts.append(f"Description:\n{job.description[:2000]}")
+            parts.append(f"Description:\n{_normalize_description(job.description)}")
         
         return "\n".join(parts)
     
+    def _cache_key(self, profile_summary: str, job_summary: str) -> str:
+        return LLMCache.make_key(profile_summary, job_summary, self.model, PROMPT_VERSION)
+    
+    def _cache_get(self, key: str) -> Optional[dict]:
+        return self.cache.get(key) if self.cache else None
+    
+    def _cache_put(self, key: str, analysis: dict) -> None:
+        if self.cache:
+            self.cache.put(key, analysis)
+    
     def _analyze_match(self, profile_summary: str, job_summary: str) -> dict:
         """Use AI to analyze the match between profile and job."""
         
-        system_prompt = """You are a job matching expert. Analyze how well a candidate matches a job.
-
-Return a JSON object with:
-{
-    "score": <0-100 integer, how well the candidate matches>,
-    "summary": "<2-3 sentence summary of the match>",
-    "matching_skills": ["skill1", "skill2", ...],
-    "skill_gaps": ["missing skill 1", "missing skill 2", ...],
-    "required_skills": ["skills mentioned in job description"],
-    "strengths": ["key strength 1", "key strength 2"],
-    "concerns": ["potential concern 1"],
-    "recommendation": "<brief recommendation for the candidate>"
-}
-
-Scoring guide:
-- 90-100: Excellent match, meets nearly all requirements
-- 80-89: Strong match, meets most requirements
-- 70-79: Good match, meets core requirements
-- 60-69: Moderate match, meets some requirements
-- 50-59: Weak match, significant gaps
-- Below 50: Poor match, major misalignment
-
-Be realistic but fair. Consider transferable skills."""
+        key = self._cache_key(profile_summary, job_summary)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        from .schemas import MatchAnalysis
+        
+        system_prompt = MATCH_SYSTEM_PROMPT
 
-        response = self.client.chat.completions.create(
-            model="gpt-4o",
+        response = self.client.beta.chat.completions.parse(
+            model=self.model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": f"CANDIDATE PROFILE:\n{profile_summary}\n\n---\n\nJOB POSTING:\n{job_summary}"}
             ],
-            response_format={"type": "json_object"},
-            temperature=0.3
+            response_format=MatchAnalysis,
+            temperature=0.3,
+            max_tokens=MATCH_MAX_TOKENS
         )
         
-        return json.loads(response.choices[0].message.content)
+        analysis = _parsed_output(response).model_dump()
+        self._cache_put(key, analysis)
+        
+        return analysis
+    
+    def _analyze_matches_batch(self, profile_summary: str, job_summaries: list[str]) -> list[dict]:
+        """Analyze several jobs against one profile in a single API call.
+        
+        Returns one analysis dict per job summary, in the same order. Jobs
+        the model skipped get an empty dict.
+        """
+        from .schemas import MatchBatch
+        
+        job_blocks = "\n\n".join(
+            f"=== JOB {i} ===\n{summary}"
+            for i, summary in enumerate(job_summaries, 1)
+        )
+        
+        response = self.client.beta.chat.completions.parse(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": BATCH_MATCH_SYSTEM_PROMPT},
+                {"role": "user", "content": f"CANDIDATE PROFILE:\n{profile_summary}\n\n---\n\nJOB POSTINGS:\n{job_blocks}"}
+            ],
+            response_format=MatchBatch,
+            temperature=0.3,
+            max_tokens=MATCH_MAX_TOKENS * len(job_summaries)
+        )
+        
+        by_index = {
+            result.index: result.model_dump(exclude={"index"})
+            for result in _parsed_output(response).results
+        }
+        
+        return [by_index.get(i, {}) for i in range(1, len(job_summaries) + 1)]
 
 
 class CoverLetterGenerator:
     """Generates tailored cover letters."""
     
-    def __init__(self, client: Optional[OpenAI] = None):
-        self.client = client or OpenAI()
+    def __init__(
+        self,
+        client: Optional["OpenAI"] = None,
+        model: str = DEFAULT_COVER_MODEL,
+        cache: Optional[LLMCache] = None
+    ):
+        if client is None:
+            from openai import OpenAI
+            client = OpenAI()
+        self.client = client
+        self.model = model
+        self.cache = cache
     
     def generate(
         self,
@@ -175,6 +456,92 @@ class CoverLetterGenerator:
         length: str = "medium"
     ) -> str:
         """Generate a tailored cover letter."""
+        key, request = self._build_request(job, profile, tone, length)
+        
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        response = self.client.chat.completions.create(**request)
+        
+        letter = response.choices[0].message.content
+        # A letter cut off at max_tokens is still shown, but never replayed
+        if self.cache and response.choices[0].finish_reason == "stop":
+            self.cache.put(key, letter)
+        
+        return letter
+    
+    def analyze_and_write(
+        self,
+        job: Job,
+        profile: Profile,
+        tone: str = "professional",
+        length: str = "medium"
+    ) -> str:
+        """Analyze the match and write the cover letter in a single API call.
+        
+        The job's match fields are filled in as JobMatcher.score_job would
+        fill them, and the letter is returned.
+        """
+        key, request = self._build_request(job, profile, tone, length)
+        key = LLMCache.make_key(key, "analyze_and_write")
+        
+        request["messages"][0]["content"] += ANALYZE_AND_WRITE_INSTRUCTIONS
+        # The letter comes back JSON-escaped inside the result, which costs more
+        # tokens than plain text, so leave a quarter again of headroom for it
+        request["max_tokens"] += request["max_tokens"] // 4 + MATCH_MAX_TOKENS
+        
+        result = self.cache.get(key) if self.cache else None
+        if result is None:
+            from .schemas import CoverLetterResult
+            
+            response = self.client.beta.chat.completions.parse(**request, response_format=CoverLetterResult)
+            result = _parsed_output(response).model_dump()
+            if self.cache:
+                self.cache.put(key, result)
+        
+        _apply_analysis(job, result.get("analysis") or {})
+        
+        return result.get("cover_letter", "")
+    
+    def generate_stream(
+        self,
+        job: Job,
+        profile: Profile,
+        tone: str = "professional",
+        length: str = "medium"
+    ) -> Iterator[str]:
+        """Generate a tailored cover letter, yielding text as it arrives."""
+        key, request = self._build_request(job, profile, tone, length)
+        
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+        
+        parts = []
+        finish_reason = None
+        for chunk in self.client.chat.completions.create(**request, stream=True):
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content or ""
+            finish_reason = chunk.choices[0].finish_reason or finish_reason
+            parts.append(text)
+            yield text
+        
+        if self.cache and finish_reason == "stop":
+            self.cache.put(key, "".join(parts))
+    
+    def _build_request(
+        self,
+        job: Job,
+        profile: Profile,
+        tone: str,
+        length: str
+    ) -> tuple[str, dict]:
+        """Build the cache key and completion arguments for a cover letter."""
         
         length_guide = {
             "short": "2-3 paragraphs, under 200 words",
@@ -182,6 +549,13 @@ class CoverLetterGenerator:
             "long": "4-5 paragraphs, 350-500 words"
         }
         
+        # Room for the upper word count plus the contact header and sign-off
+        max_tokens = {
+            "short": 400,
+            "medium": 600,
+            "long": 850
+        }
+        
         tone_guide = {
             "professional": "formal, polished, business-appropriate",
             "casual": "friendly but professional, conversational",
@@ -189,7 +563,7 @@ class CoverLetterGenerator:
         }
         
         # Build context
-        profile_summary = self._build_profile_context(profile)
+        profile_summary = self._build_profile_context(profile, job)
         job_summary = self._build_job_context(job)
         
         system_prompt = f"""You are an expert cover letter writer. Write compelling, tailored cover letters.
@@ -223,18 +597,23 @@ JOB:
 
 Focus on the most relevant experiences and create a compelling narrative."""
 
-        response = self.client.chat.completions.create(
-            model="gpt-4o",
+        key = LLMCache.make_key(
+            profile_summary, job_summary, self.model, PROMPT_VERSION, tone, length
+        )
+        
+        request = dict(
+            model=self.model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
             ],
-            temperature=0.7
+            temperature=0.7,
+            max_tokens=max_tokens.get(length, max_tokens["medium"])
         )
         
-        return response.choices[0].message.content
+        return key, request
     
-    def _build_profile_context(self, profile: Profile) -> str:
+    def _build_profile_context(self, profile: Profile, job: Job) -> str:
         """Build profile context for cover letter generation."""
         parts = [
             f"Name: {profile.name}",
@@ -266,9 +645,11 @@ Focus on the most relevant experiences and create a compelling narrative."""
             parts.append("\nKey Experience:" + "".join(exp_parts))
         
         # Skills
-        all_skills = profile.get_all_skills()
-        if all_skills:
-            parts.append(f"\nSkills: {', '.join(all_skills[:15])}")
+        # Only the skills most relevant to this job
+        job_text = " ".join([job.title, job.description, *job.required_skills])
+        top_skills = _rank_skills(profile.get_all_skills(), job_text)
+        if top_skills:
+            parts.append(f"\nSkills: {', '.join(top_skills)}")
         
         return "\n".join(parts)
     
@@ -281,7 +662,7 @@ Focus on the most relevant experiences and create a compelling narrative."""
         ]
         
         if job.description:
-            parts.append(f"\nJob Description:\n{job.description[:2500]}")
+            parts.append(f"\nJob Description:\n{_normalize_description(job.description, max_tokens=500)}")
         
         if job.required_skills:
             parts.append(f"\nRequired Skills: {', '.join(job.required_skills)}")
@@ -1,6 +1,6 @@
 """Data models for JobHunter AI."""
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Optional
@@ -25,7 +25,13 @@ class WorkType(Enum):
     ONSITE = "onsite"
 
 
-@dataclass
+# Plain dict lookups for deserialization, skipping Enum.__call__; the CLI
+# also uses STATUS_BY_VALUE for its --status choices
+STATUS_BY_VALUE = {s.value: s for s in ApplicationStatus}
+_WORK_TYPE_BY_VALUE = {w.value: w for w in WorkType}
+
+
+@dataclass(slots=True)
 class Experience:
     """Work experience entry."""
     title: str
@@ -36,17 +42,10 @@ class Experience:
     highlights: list[str] = field(default_factory=list)
     
     def to_dict(self) -> dict:
-        return {
-            "title": self.title,
-            "company": self.company,
-            "start_date": self.start_date,
-            "end_date": self.end_date,
-            "location": self.location,
-            "highlights": self.highlights,
-        }
+        return asdict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class Education:
     """Education entry."""
     degree: str
@@ -56,16 +55,10 @@ class Education:
     gpa: Optional[float] = None
     
     def to_dict(self) -> dict:
-        return {
-            "degree": self.degree,
-            "school": self.school,
-            "year": self.year,
-            "field": self.field,
-            "gpa": self.gpa,
-        }
+        return asdict(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class Profile:
     """User profile for job matching."""
     name: str
@@ -99,29 +92,9 @@ class Profile:
     portfolio: Optional[str] = None
     
     def to_dict(self) -> dict:
-        return {
-            "name": self.name,
-            "email": self.email,
-            "phone": self.phone,
-            "location": self.location,
-            "summary": self.summary,
-            "experience": [e.to_dict() for e in self.experience],
-            "education": [e.to_dict() for e in self.education],
-            "skills": self.skills,
-            "languages": self.languages,
-            "frameworks": self.frameworks,
-            "tools": self.tools,
-            "domains": self.domains,
-            "target_roles": self.target_roles,
-            "target_locations": self.target_locations,
-            "salary_min": self.salary_min,
-            "salary_max": self.salary_max,
-            "work_types": [w.value for w in self.work_types],
-            "visa_sponsorship_needed": self.visa_sponsorship_needed,
-            "linkedin": self.linkedin,
-            "github": self.github,
-            "portfolio": self.portfolio,
-        }
+        data = asdict(self)
+        data["work_types"] = [w.value for w in self.work_types]
+        return data
     
     @classmethod
     def from_dict(cls, data: dict) -> "Profile":
@@ -132,7 +105,7 @@ class Profile:
             Education(**edu) for edu in data.get("education", [])
         ]
         work_types = [
-            WorkType(wt) for wt in data.get("work_types", [])
+            _WORK_TYPE_BY_VALUE[wt] for wt in data.get("work_types", [])
         ]
         
         return cls(
@@ -160,11 +133,11 @@ class Profile:
         )
     
     def get_all_skills(self) -> list[str]:
-        """Get all skills combined."""
-        return list(set(
-            self.skills + self.languages + self.frameworks + 
-            self.tools + self.domains
-        ))
+        """Get all skills combined, deduplicated and sorted."""
+        return sorted({
+            *self.skills, *self.languages, *self.frameworks,
+            *self.tools, *self.domains
+        })
     
     def get_years_experience(self) -> float:
         """Calculate total years of experience."""
@@ -172,7 +145,7 @@ class Profile:
         return len(self.experience) * 1.5  # Rough estimate
 
 
-@dataclass
+@dataclass(slots=True)
 class Job:
     """Job listing."""
     id: str
@@ -227,9 +200,35 @@ class Job:
             "skill_matches": self.skill_matches,
             "skill_gaps": self.skill_gaps,
         }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "Job":
+        return cls(
+            id=data["id"],
+            title=data["title"],
+            company=data["company"],
+            location=data["location"],
+            description=data["description"],
+            url=data["url"],
+            source=data["source"],
+            salary_min=data.get("salary_min"),
+            salary_max=data.get("salary_max"),
+            salary_currency=data.get("salary_currency", "EUR"),
+            work_type=_WORK_TYPE_BY_VALUE[data["work_type"]] if data.get("work_type") else None,
+            experience_level=data.get("experience_level"),
+            posted_date=datetime.fromisoformat(data["posted_date"]) if data.get("posted_date") else None,
+            required_skills=data.get("required_skills", []),
+            preferred_skills=data.get("preferred_skills", []),
+            benefits=data.get("benefits", []),
+            visa_sponsorship=data.get("visa_sponsorship"),
+            match_score=data.get("match_score"),
+            match_analysis=data.get("match_analysis"),
+            skill_matches=data.get("skill_matches", []),
+            skill_gaps=data.get("skill_gaps", []),
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class Application:
     """Job application tracking."""
     id: str
@@ -253,11 +252,11 @@ class Application:
     # Timeline
     events: list[dict] = field(default_factory=list)
     
-    def add_event(self, event_type: str, notes: str = ""):
-        """Add an event to the timeline."""
+    def add_event(self, event_type: str, notes: str = "", date: Optional[str] = None):
+        """Add an event to the timeline, dated now unless an ISO date is given."""
         self.events.append({
             "type": event_type,
-            "date": datetime.now().isoformat(),
+            "date": date or datetime.now().isoformat(),
             "notes": notes,
         })
     
@@ -276,3 +275,20 @@ class Application:
             "recruiter_email": self.recruiter_email,
             "events": self.events,
         }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "Application":
+        return cls(
+            id=data["id"],
+            job=Job.from_dict(data["job"]),
+            status=STATUS_BY_VALUE[data["status"]],
+            applied_date=datetime.fromisoformat(data["applied_date"]) if data.get("applied_date") else None,
+            cover_letter_path=data.get("cover_letter_path"),
+            resume_version=data.get("resume_version"),
+            notes=data.get("notes", ""),
+            next_action=data.get("next_action"),
+            next_action_date=datetime.fromisoformat(data["next_action_date"]) if data.get("next_action_date") else None,
+            recruiter_name=data.get("recruiter_name"),
+            recruiter_email=data.get("recruiter_email"),
+            events=data.get("events", []),
+        )
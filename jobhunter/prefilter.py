@@ -0,0 +1,67 @@
+"""Cheap local ranking of jobs before AI scoring."""
+
+import math
+import re
+from collections import Counter
+
+from .models import Job, Profile
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens, keeping terms like c++ and node.js."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def bm25_scores(
+    documents: list[list[str]],
+    query: set[str],
+    k1: float = 1.5,
+    b: float = 0.75
+) -> list[float]:
+    """Score tokenized documents against a set of query terms with Okapi BM25."""
+    if not documents:
+        return []
+
+    n_docs = len(documents)
+    avg_len = sum(len(doc) for doc in documents) / n_docs or 1.0
+    term_counts = [Counter(doc) for doc in documents]
+
+    idf = {}
+    for term in query:
+        df = sum(1 for counts in term_counts if term in counts)
+        idf[term] = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+    scores = []
+    for doc, counts in zip(documents, term_counts):
+        norm = k1 * (1 - b + b * len(doc) / avg_len)
+        score = 0.0
+        for term in query:
+            tf = counts.get(term, 0)
+            if tf:
+                score += idf[term] * tf * (k1 + 1) / (tf + norm)
+        scores.append(score)
+
+    return scores
+
+
+def shortlist(jobs: list[Job], profile: Profile, top_m: int = 15) -> list[Job]:
+    """Return the top_m jobs by keyword overlap with the profile's skills and target roles."""
+    if len(jobs) <= top_m:
+        return jobs
+
+    query = set(tokenize(" ".join(profile.get_all_skills() + profile.target_roles)))
+    if not query:
+        return jobs[:top_m]
+
+    documents = [
+        tokenize(" ".join([job.title, job.description, *job.required_skills]))
+        for job in jobs
+    ]
+    scores = bm25_scores(documents, query)
+
+    # sorted() is stable, so equally scored jobs keep their search order
+    ranked = sorted(zip(scores, range(len(jobs))), key=lambda pair: pair[0], reverse=True)
+    return [jobs[i] for _, i in ranked[:top_m]]
@@ -1,12 +1,18 @@
 """Profile management for JobHunter AI."""
 
-import json
 import os
 from pathlib import Path
 from typing import Optional
 
 import yaml
 
+try:
+    # libyaml bindings parse and emit in C
+    from yaml import CSafeDumper as _YamlDumper, CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper, SafeLoader as _YamlLoader
+
+from . import jsonutil
 from .models import Profile, Experience, Education, WorkType
 
 
@@ -28,14 +34,14 @@ class ProfileManager:
             return None
         
         with open(self.profile_path, "r") as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=_YamlLoader)
         
         return Profile.from_dict(data)
     
     def save(self, profile: Profile) -> None:
         """Save profile to disk."""
         with open(self.profile_path, "w") as f:
-            yaml.dump(profile.to_dict(), f, default_flow_style=False, sort_keys=False)
+            yaml.dump(profile.to_dict(), f, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False)
     
     def delete(self) -> None:
         """Delete profile."""
@@ -43,12 +49,7 @@ class ProfileManager:
             self.profile_path.unlink()
 
 
-def parse_resume_with_llm(resume_text: str, client) -> Profile:
-    """Parse resume text into a Profile using LLM."""
-    
-    system_prompt = """You are a resume parser. Extract structured information from resumes.
-Return a JSON object with the following structure:
-{
+RESUME_SCHEMA = """{
     "name": "Full Name",
     "email": "email@example.com",
     "phone": "+1234567890",
@@ -77,22 +78,86 @@ Return a JSON object with the following structure:
     "frameworks": ["TensorFlow", "PyTorch"],
     "tools": ["Docker", "AWS"],
     "domains": ["Machine Learning", "NLP"]
-}
+}"""
+
+RESUME_SYSTEM_PROMPT = f"""You are a resume parser. Extract structured information from resumes.
+Return a JSON object with the following structure:
+{RESUME_SCHEMA}
 
 Be thorough but accurate. Only include information explicitly stated in the resume."""
 
+BATCH_RESUME_SYSTEM_PROMPT = f"""You are a resume parser. Extract structured information from each of several resumes.
+
+The resumes are numbered "=== RESUME 1 ===", "=== RESUME 2 ===", etc. Parse every resume independently.
+
+Return a JSON object with a "profiles" array holding one entry per resume:
+{{
+    "profiles": [
+        {{"index": <resume number>, ...profile fields...}}
+    ]
+}}
+
+Each profile has the structure:
+{RESUME_SCHEMA}
+
+Be thorough but accurate. Only include information explicitly stated in each resume."""
+
+
+def parse_resume_with_llm(resume_text: str, client) -> Profile:
+    """Parse resume text into a Profile using LLM."""
+    
     response = client.chat.completions.create(
         model="gpt-4o",
         messages=[
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": RESUME_SYSTEM_PROMPT},
             {"role": "user", "content": f"Parse this resume:\n\n{resume_text}"}
         ],
         response_format={"type": "json_object"}
     )
     
-    data = json.loads(response.choices[0].message.content)
+    data = jsonutil.loads(response.choices[0].message.content)
+    
+    return _profile_from_resume_data(data)
+
+
+def parse_resumes_with_llm(resume_texts: list[str], client) -> list[Profile]:
+    """Parse several resumes into Profiles with a single LLM call.
+    
+    Returns one Profile per resume, in the same order. Resumes the model
+    skipped come back as empty Profiles.
+    """
+    if not resume_texts:
+        return []
+    
+    resume_blocks = "\n\n".join(
+        f"=== RESUME {i} ===\n{text}"
+        for i, text in enumerate(resume_texts, 1)
+    )
+    
+    response = client.chat.completions.create(
+        model="gpt-4o",
+        messages=[
+            {"role": "system", "content": BATCH_RESUME_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Parse these resumes:\n\n{resume_blocks}"}
+        ],
+        response_format={"type": "json_object"}
+    )
+    
+    profiles = jsonutil.loads(response.choices[0].message.content).get("profiles", [])
+    
+    by_index = {}
+    for data in profiles:
+        if isinstance(data, dict) and isinstance(data.get("index"), int):
+            by_index[data["index"]] = data
     
-    # Convert to Profile
+    return [
+        _profile_from_resume_data(by_index.get(i, {}))
+        for i in range(1, len(resume_texts) + 1)
+    ]
+
+
+def _profile_from_resume_data(data: dict) -> Profile:
+    """Build a Profile from parsed resume JSON, tolerating missing fields."""
     experience = [
         Experience(
             title=exp.get("title", ""),
@@ -133,14 +198,23 @@ Be thorough but accurate. Only include information explicitly stated in the resu
 
 def extract_text_from_pdf(pdf_path: str) -> str:
     """Extract text from a PDF file."""
+    try:
+        # PDFium's C++ text extraction is much faster than pypdf's
+        import pypdfium2 as pdfium
+        
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            return "".join(page.get_textpage().get_text_range() + "\n" for page in pdf)
+        finally:
+            pdf.close()
+    except ImportError:
+        pass
+    
     try:
         import pypdf
         
         reader = pypdf.PdfReader(pdf_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+        return "".join(page.extract_text() + "\n" for page in reader.pages)
     except ImportError:
         raise ImportError("pypdf is required for PDF parsing. Install with: pip install pypdf")
 
@@ -0,0 +1,28 @@
+"""Structured output schemas for LLM responses."""
+
+from pydantic import BaseModel
+
+
+class MatchAnalysis(BaseModel):
+    """How well a candidate matches one job."""
+    score: int
+    summary: str
+    matching_skills: list[str]
+    skill_gaps: list[str]
+    required_skills: list[str]
+
+
+class IndexedMatchAnalysis(MatchAnalysis):
+    """Match analysis for one numbered job in a batch."""
+    index: int
+
+
+class MatchBatch(BaseModel):
+    """Match analyses for a batch of jobs."""
+    results: list[IndexedMatchAnalysis]
+
+
+class CoverLetterResult(BaseModel):
+    """Match analysis and cover letter produced by one call."""
+    analysis: MatchAnalysis
+    cover_letter: str
@@ -1,27 +1,72 @@
 """Job scraping from various sources."""
 
 import hashlib
+import logging
 import re
+import threading
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 from typing import Optional
 from urllib.parse import quote_plus
 
 import requests
 from bs4 import BeautifulSoup
 
+from . import jsonutil
 from .models import Job, WorkType
 
+try:
+    import lxml  # noqa: F401
+    # lxml's C parser is much faster than the pure-Python html.parser
+    _HTML_PARSER = "lxml"
+except ImportError:
+    _HTML_PARSER = "html.parser"
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+HTTP_CACHE_PATH = Path.home() / ".jobhunter" / "http_cache"
+
+log = logging.getLogger(__name__)
+
 
 class JobScraper(ABC):
     """Base class for job scrapers."""
     
+    # Seconds a successful response is reused when requests-cache is installed
+    CACHE_EXPIRE_AFTER = 3600
+    
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = self._make_session()
+    
+    def _make_session(self) -> requests.Session:
+        """Create an HTTP session, cached on disk if requests-cache is available."""
+        if requests_cache is None:
+            session = requests.Session()
+        else:
+            HTTP_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            session = requests_cache.CachedSession(
+                cache_name=str(HTTP_CACHE_PATH),
+                backend="sqlite",
+                expire_after=self.CACHE_EXPIRE_AFTER,
+                allowable_codes=[200],
+            )
+        
+        session.headers.update({
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
         })
+        return session
+    
+    @staticmethod
+    def _throttle(response: requests.Response, seconds: float) -> None:
+        """Pause between live requests; cached responses never reached the site."""
+        if not getattr(response, "from_cache", False):
+            time.sleep(seconds)
     
     @abstractmethod
     def search(self, query: str, location: str = "", **kwargs) -> list[Job]:
@@ -35,8 +80,14 @@ class JobScraper(ABC):
     
     def _generate_id(self, *args) -> str:
         """Generate a unique ID from arguments."""
-        content = "|".join(str(a) for a in args)
-        return hashlib.md5(content.encode()).hexdigest()[:12]
+        # A 6-byte BLAKE2b digest gives the same 12 hex characters as before
+        # and is faster than MD5 in hashlib
+        digest = hashlib.blake2b(digest_size=6)
+        for i, arg in enumerate(args):
+            if i:
+                digest.update(b"|")
+            digest.update(str(arg).encode())
+        return digest.hexdigest()
 
 
 class LinkedInScraper(JobScraper):
@@ -44,6 +95,21 @@ class LinkedInScraper(JobScraper):
     
     BASE_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
     
+    EXPERIENCE_LEVELS = {
+        "entry": "1",
+        "mid": "2",
+        "senior": "3",
+        "director": "4",
+        "executive": "5",
+    }
+    
+    # (tag, attrs) pairs for BeautifulSoup's find(), built once per class
+    _CARD = ("div", {"class": "base-card"})
+    _TITLE = ("h3", {"class": "base-search-card__title"})
+    _COMPANY = ("h4", {"class": "base-search-card__subtitle"})
+    _LOCATION = ("span", {"class": "job-search-card__location"})
+    _LINK = ("a", {"class": "base-card__full-link"})
+    
     def search(
         self, 
         query: str, 
@@ -66,29 +132,23 @@ class LinkedInScraper(JobScraper):
             params["f_WT"] = "2"  # Remote filter
         
         if experience_level:
-            level_map = {
-                "entry": "1",
-                "mid": "2", 
-                "senior": "3",
-                "director": "4",
-                "executive": "5",
-            }
-            if experience_level.lower() in level_map:
-                params["f_E"] = level_map[experience_level.lower()]
+            level = self.EXPERIENCE_LEVELS.get(experience_level.lower())
+            if level:
+                params["f_E"] = level
         
         try:
             response = self.session.get(self.BASE_URL, params=params, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, "html.parser")
-            job_cards = soup.find_all("div", class_="base-card")
+            soup = BeautifulSoup(response.text, _HTML_PARSER)
+            job_cards = soup.find_all(*self._CARD, limit=max_results)
             
-            for card in job_cards[:max_results]:
+            for card in job_cards:
                 try:
-                    title_elem = card.find("h3", class_="base-search-card__title")
-                    company_elem = card.find("h4", class_="base-search-card__subtitle")
-                    location_elem = card.find("span", class_="job-search-card__location")
-                    link_elem = card.find("a", class_="base-card__full-link")
+                    title_elem = card.find(*self._TITLE)
+                    company_elem = card.find(*self._COMPANY)
+                    location_elem = card.find(*self._LOCATION)
+                    link_elem = card.find(*self._LINK)
                     
                     if not all([title_elem, company_elem, link_elem]):
                         continue
@@ -109,14 +169,15 @@ class LinkedInScraper(JobScraper):
                         url=url,
                         source="linkedin",
                     ))
-                except Exception:
+                except (AttributeError, KeyError) as e:
+                    log.debug("Skipping malformed card: %s", e)
                     continue
             
             # Rate limiting
-            time.sleep(1)
+            self._throttle(response, 1)
             
         except Exception as e:
-            print(f"LinkedIn search error: {e}")
+            log.warning("LinkedIn search error: %s", e)
         
         return jobs
     
@@ -132,6 +193,13 @@ class IndeedScraper(JobScraper):
     
     BASE_URL = "https://www.indeed.com/jobs"
     
+    # (tag, attrs) pairs for BeautifulSoup's find(), built once per class
+    _CARD = ("div", {"class": "job_seen_beacon"})
+    _TITLE = ("h2", {"class": "jobTitle"})
+    _COMPANY = ("span", {"data-testid": "company-name"})
+    _LOCATION = ("div", {"data-testid": "text-location"})
+    _JOB_KEY = ("a", {"data-jk": True})
+    
     def search(
         self,
         query: str,
@@ -155,14 +223,14 @@ class IndeedScraper(JobScraper):
             response = self.session.get(self.BASE_URL, params=params, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, "html.parser")
-            job_cards = soup.find_all("div", class_="job_seen_beacon")
+            soup = BeautifulSoup(response.text, _HTML_PARSER)
+            job_cards = soup.find_all(*self._CARD, limit=max_results)
             
-            for card in job_cards[:max_results]:
+            for card in job_cards:
                 try:
-                    title_elem = card.find("h2", class_="jobTitle")
-                    company_elem = card.find("span", {"data-testid": "company-name"})
-                    location_elem = card.find("div", {"data-testid": "text-location"})
+                    title_elem = card.find(*self._TITLE)
+                    company_elem = card.find(*self._COMPANY)
+                    location_elem = card.find(*self._LOCATION)
                     
                     if not all([title_elem, company_elem]):
                         continue
@@ -172,7 +240,7 @@ class IndeedScraper(JobScraper):
                     job_location = location_elem.get_text(strip=True) if location_elem else location
                     
                     # Get job key for URL
-                    job_key = card.find("a", {"data-jk": True})
+                    job_key = card.find(*self._JOB_KEY)
                     if job_key:
                         jk = job_key.get("data-jk", "")
                         url = f"https://www.indeed.com/viewjob?jk={jk}"
@@ -190,13 +258,14 @@ class IndeedScraper(JobScraper):
                         url=url,
                         source="indeed",
                     ))
-                except Exception:
+                except (AttributeError, KeyError) as e:
+                    log.debug("Skipping malformed card: %s", e)
                     continue
             
-            time.sleep(1)
+            self._throttle(response, 1)
             
         except Exception as e:
-            print(f"Indeed search error: {e}")
+            log.warning("Indeed search error: %s", e)
         
         return jobs
     
@@ -207,8 +276,24 @@ class IndeedScraper(JobScraper):
 class GreenhouseScraper(JobScraper):
     """Scraper for Greenhouse job boards."""
     
+    # Board listings change slowly, so they are reused for longer
+    CACHE_EXPIRE_AFTER = 6 * 3600
+    
+    MAX_CONCURRENT_BOARDS = 4
+    
+    # Shared by every instance, so concurrent searches (e.g. recommend's
+    # parallel role searches) still keep at most 4 requests in flight
+    _request_slots = threading.Semaphore(MAX_CONCURRENT_BOARDS)
+    
+    # One lock per board, so a board fetched by several searches at once is
+    # downloaded once and the others are served from the HTTP cache
+    _board_locks: dict[str, threading.Lock] = {}
+    _board_locks_guard = threading.Lock()
+    
     def __init__(self, company_boards: list[str] = None):
-        super().__init__()
+        # No shared session: each board fetch opens and closes its own, since
+        # requests sessions aren't thread-safe
+        
         # Popular tech companies using Greenhouse
         self.company_boards = company_boards or [
             "stripe",
@@ -225,52 +310,71 @@ class GreenhouseScraper(JobScraper):
         self,
         query: str,
         location: str = "",
+        remote: bool = False,
         max_results: int = 25
     ) -> list[Job]:
         """Search Greenhouse job boards."""
         jobs = []
         
-        for company in self.company_boards:
-            try:
-                url = f"https://boards-api.greenhouse.io/v1/boards/{company}/jobs"
-                response = self.session.get(url, timeout=10)
+        # Fold the filters once rather than per job
+        query_key = query.casefold()
+        location_key = location.casefold()
+        
+        # Boards are independent GETs, so fetch them side by side
+        with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_BOARDS) as executor:
+            boards = list(executor.map(self._fetch_board, self.company_boards))
+        
+        for company, board_jobs in zip(self.company_boards, boards):
+            for job_data in board_jobs:
+                # Postings can carry explicit nulls; one shouldn't sink the search
+                title = job_data.get("title") or ""
+                job_location = (job_data.get("location") or {}).get("name") or ""
                 
-                if response.status_code != 200:
+                # Filter by query and location
+                if query_key not in title.casefold():
+                    continue
+                if location_key and location_key not in job_location.casefold():
+                    continue
+                if remote and "remote" not in job_location.casefold():
                     continue
                 
-                data = response.json()
+                job_id = self._generate_id("greenhouse", company, job_data.get("id"))
                 
-                for job_data in data.get("jobs", []):
-                    title = job_data.get("title", "")
-                    job_location = job_data.get("location", {}).get("name", "")
-                    
-                    # Filter by query and location
-                    if query.lower() not in title.lower():
-                        continue
-                    if location and location.lower() not in job_location.lower():
-                        continue
-                    
-                    job_id = self._generate_id("greenhouse", company, job_data.get("id"))
-                    
-                    jobs.append(Job(
-                        id=job_id,
-                        title=title,
-                        company=company.title(),
-                        location=job_location,
-                        description=job_data.get("content", ""),
-                        url=job_data.get("absolute_url", ""),
-                        source="greenhouse",
-                    ))
-                    
-                    if len(jobs) >= max_results:
-                        break
+                jobs.append(Job(
+                    id=job_id,
+                    title=title,
+                    company=company.title(),
+                    location=job_location,
+                    description=job_data.get("content") or "",
+                    url=job_data.get("absolute_url") or "",
+                    source="greenhouse",
+                ))
                 
-                time.sleep(0.5)
-                
-            except Exception as e:
-                continue
+                if len(jobs) >= max_results:
+                    return jobs
         
-        return jobs[:max_results]
+        return jobs
+    
+    def _fetch_board(self, company: str) -> list[dict]:
+        """Fetch the raw job list for one board, or an empty list on failure."""
+        try:
+            url = f"https://boards-api.greenhouse.io/v1/boards/{company}/jobs"
+            with self._board_lock(company), self._request_slots, self._make_session() as session:
+                response = session.get(url, timeout=10)
+            
+            if response.status_code != 200:
+                return []
+            
+            return jsonutil.loads(response.content).get("jobs", [])
+        except Exception as e:
+            log.debug("Skipping Greenhouse board %s: %s", company, e)
+            return []
+    
+    @classmethod
+    def _board_lock(cls, company: str) -> threading.Lock:
+        """Return the lock that serializes fetches of one board."""
+        with cls._board_locks_guard:
+            return cls._board_locks.setdefault(company, threading.Lock())
     
     def get_job_details(self, job_id: str) -> Optional[Job]:
         return None
@@ -297,32 +401,31 @@ class JobSearchAggregator:
         """Search across all sources."""
         all_jobs = []
         
-        sources = sources or list(self.scrapers.keys())
+        sources = [s for s in (sources or self.scrapers) if s in self.scrapers]
+        if not sources:
+            return []
         
-        for source in sources:
-            if source not in self.scrapers:
-                continue
-            
-            scraper = self.scrapers[source]
-            
+        def search_source(source: str) -> list[Job]:
             try:
-                jobs = scraper.search(
+                return self.scrapers[source].search(
                     query=query,
                     location=location,
                     remote=remote,
                     max_results=max_per_source
                 )
-                all_jobs.extend(jobs)
             except Exception as e:
-                print(f"Error searching {source}: {e}")
+                log.warning("Error searching %s: %s", source, e)
+                return []
+        
+        # Each scraper owns its session and the work is network-bound, so the
+        # sources run side by side; map() keeps results in source order
+        with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+            for jobs in executor.map(search_source, sources):
+                all_jobs.extend(jobs)
         
-        # Deduplicate by title + company
-        seen = set()
-        unique_jobs = []
+        # Deduplicate by title + company, keeping the first job seen
+        unique_jobs = {}
         for job in all_jobs:
-            key = f"{job.title.lower()}|{job.company.lower()}"
-            if key not in seen:
-                seen.add(key)
-                unique_jobs.append(job)
+            unique_jobs.setdefault((job.title.casefold(), job.company.casefold()), job)
         
-        return unique_jobs
+        return list(unique_jobs.values())
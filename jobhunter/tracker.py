@@ -1,177 +1,417 @@
 """Application tracking for JobHunter AI."""
 
-import json
-import uuid
+import copy
+import logging
+import secrets
+import sqlite3
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
+from . import jsonutil
 from .models import Application, ApplicationStatus, Job
 
+log = logging.getLogger(__name__)
+
+
+# Columns returned by list_all() and search(), matching the old index entries
+_SUMMARY_COLUMNS = "id, job_id, company, title, status, created_at, updated_at"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id TEXT PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    company TEXT NOT NULL,
+    title TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS applications_status_updated
+    ON applications (status, updated_at DESC);
+CREATE INDEX IF NOT EXISTS applications_updated
+    ON applications (updated_at DESC);
+
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    app_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    date TEXT NOT NULL,
+    notes TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_app ON events (app_id);
+"""
+
+# Trigram index over company and title, so substring search doesn't scan every row
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE applications_fts USING fts5(
+    app_id UNINDEXED, company, title, tokenize = 'trigram'
+);
+INSERT INTO applications_fts (app_id, company, title)
+    SELECT id, company, title FROM applications;
+"""
+
+# The trigram tokenizer can't match anything shorter than this
+_FTS_MIN_QUERY = 3
+
+# Stay well below SQLite's limit on bound parameters per statement
+_MAX_QUERY_PARAMS = 500
+
+
+def _drop_empty(data: dict) -> dict:
+    """Drop None and empty-list values; from_dict restores them as defaults."""
+    return {k: v for k, v in data.items() if v is not None and v != []}
+
 
 class ApplicationTracker:
-    """Tracks job applications."""
+    """Tracks job applications.
+    
+    Applications live in a single SQLite database. Status and timestamps
+    are columns so listing, filtering and stats never touch the full
+    application data, which is stored as a JSON payload. Timeline events
+    have their own table, so a status change is one UPDATE and one INSERT.
+    """
     
-    def __init__(self, data_dir: Optional[Path] = None):
+    def __init__(self, data_dir: Optional[Path] = None, max_cached: int = 128):
         self.data_dir = data_dir or Path.home() / ".jobhunter" / "applications"
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        self.index_path = self.data_dir / "index.json"
-        self._load_index()
-    
-    def _load_index(self):
-        """Load application index."""
-        if self.index_path.exists():
-            with open(self.index_path, "r") as f:
-                self.index = json.load(f)
-        else:
-            self.index = {"applications": {}}
+        self.db_path = self.data_dir / "applications.db"
+        self.max_cached = max_cached
+        self._cache: OrderedDict[str, tuple[str, Application]] = OrderedDict()
+        
+        # Autocommit mode; multi-statement writes use batch()
+        self.conn = sqlite3.connect(self.db_path, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # SQLite's lower() only folds ASCII
+        self.conn.create_function("casefold", 1, str.casefold, deterministic=True)
+        self.conn.executescript(_SCHEMA)
+        self._fts = self._create_search_index()
+        
+        self._migrate_json_index()
+    
+    def _create_search_index(self) -> bool:
+        """Create and fill the FTS5 search table if needed; False if SQLite lacks trigram FTS5."""
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'applications_fts'"
+        ).fetchone()
+        if exists:
+            return True
+        
+        try:
+            self.conn.executescript(f"BEGIN; {_FTS_SCHEMA} COMMIT;")
+        except sqlite3.OperationalError:
+            # FTS5 not compiled in, or SQLite older than 3.34
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+            return False
+        return True
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+    
+    @contextmanager
+    def batch(self) -> Iterator[sqlite3.Connection]:
+        """Run the enclosed changes as one transaction with a single commit.
+        
+        Wrap bulk imports in this so they pay for one commit instead of one
+        per application. Nested batches join the outermost one.
+        """
+        if self.conn.in_transaction:
+            yield self.conn
+            return
+        
+        self.conn.execute("BEGIN")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+    
+    def _migrate_json_index(self):
+        """Import applications from the old index.json + per-application files."""
+        index_path = self.data_dir / "index.json"
+        if not index_path.exists():
+            return
+        
+        try:
+            with open(index_path, "rb") as f:
+                applications = jsonutil.loads(f.read()).get("applications", {})
+        except (OSError, ValueError, AttributeError) as e:
+            # Leave the index in place; the tracker still works without it
+            log.warning("Skipping migration of unreadable %s: %s", index_path, e)
+            return
+        
+        now_iso = datetime.now().isoformat()
+        with self.batch():
+            for app_id, entry in applications.items():
+                app_path = self.data_dir / f"{app_id}.json"
+                if not app_path.exists():
+                    continue
+                
+                # One unreadable file shouldn't block the rest of the import
+                self.conn.execute("SAVEPOINT legacy_application")
+                try:
+                    with open(app_path, "rb") as f:
+                        application = Application.from_dict(jsonutil.loads(f.read()))
+                    created_at = entry.get("created_at") or now_iso
+                    self._insert(application, created_at, entry.get("updated_at") or created_at)
+                except (OSError, ValueError, KeyError, TypeError, AttributeError, sqlite3.Error) as e:
+                    self.conn.execute("ROLLBACK TO legacy_application")
+                    log.warning("Skipping unreadable application file %s: %s", app_path, e)
+                self.conn.execute("RELEASE legacy_application")
+        
+        # Keep the old files around, but make sure they're only imported once
+        index_path.rename(index_path.with_suffix(".json.migrated"))
+    
+    def _insert(self, application: Application, created_at: str, updated_at: str):
+        """Insert an application row and its events."""
+        payload = _drop_empty(application.to_dict())
+        payload["job"] = _drop_empty(payload["job"])
+        # Status and events have their own columns/table and are kept current there
+        payload.pop("status", None)
+        payload.pop("events", None)
+        
+        self.conn.execute(
+            "INSERT OR REPLACE INTO applications VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                application.id,
+                application.job.id,
+                application.job.company,
+                application.job.title,
+                application.status.value,
+                created_at,
+                updated_at,
+                jsonutil.dumps(payload),
+            ),
+        )
+        self.conn.executemany(
+            "INSERT INTO events (app_id, type, date, notes) VALUES (?, ?, ?, ?)",
+            [(application.id, e["type"], e["date"], e["notes"]) for e in application.events],
+        )
+        
+        if self._fts:
+            self.conn.execute("DELETE FROM applications_fts WHERE app_id = ?", (application.id,))
+            self.conn.execute(
+                "INSERT INTO applications_fts (app_id, company, title) VALUES (?, ?, ?)",
+                (application.id, application.job.company, application.job.title),
+            )
     
-    def _save_index(self):
-        """Save application index."""
-        with open(self.index_path, "w") as f:
-            json.dump(self.index, f, indent=2, default=str)
+    def _new_id(self) -> str:
+        """Generate an unused 8-character application ID."""
+        while True:
+            app_id = secrets.token_hex(4)
+            # 32 random bits can collide, and _insert would overwrite the existing row
+            if not self.conn.execute("SELECT 1 FROM applications WHERE id = ?", (app_id,)).fetchone():
+                return app_id
     
     def add(self, job: Job, status: ApplicationStatus = ApplicationStatus.SAVED) -> Application:
         """Add a new application."""
-        app_id = str(uuid.uuid4())[:8]
+        app_id = self._new_id()
+        now = datetime.now()
+        now_iso = now.isoformat()
         
         application = Application(
             id=app_id,
             job=job,
             status=status,
-            applied_date=datetime.now() if status != ApplicationStatus.SAVED else None,
+            applied_date=now if status != ApplicationStatus.SAVED else None,
         )
         
-        application.add_event("created", f"Application created with status: {status.value}")
-        
-        # Save to index
-        self.index["applications"][app_id] = {
-            "id": app_id,
-            "job_id": job.id,
-            "company": job.company,
-            "title": job.title,
-            "status": status.value,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-        }
-        self._save_index()
+        application.add_event("created", f"Application created with status: {status.value}", now_iso)
         
-        # Save full application data
-        self._save_application(application)
+        with self.batch():
+            self._insert(application, now_iso, now_iso)
         
+        self._remember(copy.deepcopy(application), now_iso)
         return application
     
-    def _save_application(self, application: Application):
-        """Save full application data."""
-        app_path = self.data_dir / f"{application.id}.json"
-        with open(app_path, "w") as f:
-            json.dump(application.to_dict(), f, indent=2, default=str)
+    def get(self, app_id: str, include_events: bool = True) -> Optional[Application]:
+        """Get an application by ID.
+        
+        Recently loaded applications are copied from an in-memory cache while
+        their updated_at is unchanged, so repeated lookups skip JSON parsing
+        and the events query.
+        Pass include_events=False to skip loading the timeline when it isn't needed.
+        """
+        applications = self.get_many([app_id], include_events)
+        return applications[0] if applications else None
     
-    def get(self, app_id: str) -> Optional[Application]:
-        """Get an application by ID."""
-        if app_id not in self.index["applications"]:
-            return None
+    def get_many(self, app_ids: list[str], include_events: bool = True) -> list[Application]:
+        """Get several applications, in the given order; unknown IDs are skipped."""
+        found = {}
         
-        app_path = self.data_dir / f"{app_id}.json"
-        if not app_path.exists():
-            return None
+        for start in range(0, len(app_ids), _MAX_QUERY_PARAMS):
+            chunk = app_ids[start:start + _MAX_QUERY_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            
+            misses = []
+            for row in self.conn.execute(
+                f"SELECT id, status, updated_at, payload FROM applications WHERE id IN ({placeholders})",
+                chunk,
+            ):
+                cached = self._cache.get(row["id"])
+                if cached is not None and cached[0] == row["updated_at"]:
+                    self._cache.move_to_end(row["id"])
+                    found[row["id"]] = copy.deepcopy(cached[1])
+                else:
+                    misses.append(row)
+            
+            if not misses:
+                continue
+            
+            events = defaultdict(list)
+            if include_events:
+                # One events query for every application that has to be loaded
+                miss_ids = [row["id"] for row in misses]
+                for event in self.conn.execute(
+                    "SELECT app_id, type, date, notes FROM events "
+                    f"WHERE app_id IN ({', '.join('?' * len(miss_ids))}) ORDER BY id",
+                    miss_ids,
+                ):
+                    events[event["app_id"]].append(
+                        {"type": event["type"], "date": event["date"], "notes": event["notes"]}
+                    )
+            
+            for row in misses:
+                data = jsonutil.loads(row["payload"])
+                data["status"] = row["status"]
+                data["events"] = events[row["id"]]
+                
+                application = Application.from_dict(data)
+                if include_events:
+                    # Only complete applications are cached
+                    self._remember(copy.deepcopy(application), row["updated_at"])
+                found[row["id"]] = application
         
-        with open(app_path, "r") as f:
-            data = json.load(f)
-        
-        # Reconstruct Application object
-        job_data = data["job"]
-        job = Job(
-            id=job_data["id"],
-            title=job_data["title"],
-            company=job_data["company"],
-            location=job_data["location"],
-            description=job_data["description"],
-            url=job_data["url"],
-            source=job_data["source"],
-        )
+        for app_id in app_ids:
+            if app_id not in found:
+                # Deleted elsewhere; don't keep serving a stale copy
+                self._cache.pop(app_id, None)
         
-        return Application(
-            id=data["id"],
-            job=job,
-            status=ApplicationStatus(data["status"]),
-            applied_date=datetime.fromisoformat(data["applied_date"]) if data.get("applied_date") else None,
-            cover_letter_path=data.get("cover_letter_path"),
-            notes=data.get("notes", ""),
-            events=data.get("events", []),
-        )
+        return [found[app_id] for app_id in app_ids if app_id in found]
+    
+    def _remember(self, application: Application, updated_at: str):
+        """Add an application to the in-memory LRU.
+        
+        Callers pass a private copy; the cache never holds an object that
+        was handed out, so unsaved edits to returned applications don't leak.
+        """
+        self._cache[application.id] = (updated_at, application)
+        self._cache.move_to_end(application.id)
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
     
     def update_status(self, app_id: str, status: ApplicationStatus, notes: str = "") -> Optional[Application]:
         """Update application status."""
-        application = self.get(app_id)
-        if not application:
+        if not self.set_status(app_id, status, notes):
             return None
         
-        old_status = application.status
-        application.status = status
-        application.add_event("status_change", f"Status changed from {old_status.value} to {status.value}. {notes}")
+        return self.get(app_id)
+    
+    def set_status(self, app_id: str, status: ApplicationStatus, notes: str = "") -> bool:
+        """Update application status without loading the application.
         
-        # Update index
-        self.index["applications"][app_id]["status"] = status.value
-        self.index["applications"][app_id]["updated_at"] = datetime.now().isoformat()
-        self._save_index()
+        Returns False if the application doesn't exist.
+        """
+        updated_at = datetime.now().isoformat()
         
-        # Save application
-        self._save_application(application)
+        with self.batch():
+            row = self.conn.execute(
+                "SELECT status, updated_at FROM applications WHERE id = ?", (app_id,)
+            ).fetchone()
+            if row is None:
+                self._cache.pop(app_id, None)
+                return False
+            
+            event = {
+                "type": "status_change",
+                "date": updated_at,
+                "notes": f"Status changed from {row['status']} to {status.value}. {notes}",
+            }
+            self.conn.execute(
+                "UPDATE applications SET status = ?, updated_at = ? WHERE id = ?",
+                (status.value, updated_at, app_id),
+            )
+            self.conn.execute(
+                "INSERT INTO events (app_id, type, date, notes) VALUES (?, ?, ?, ?)",
+                (app_id, event["type"], event["date"], event["notes"]),
+            )
         
-        return application
+        # Patch a current cached copy so the next get() needn't reload it
+        cached = self._cache.get(app_id)
+        if cached is not None and cached[0] == row["updated_at"]:
+            application = cached[1]
+            application.status = status
+            application.events.append(event)
+            self._remember(application, updated_at)
+        else:
+            self._cache.pop(app_id, None)
+        
+        return True
     
     def list_all(self, status_filter: Optional[ApplicationStatus] = None) -> list[dict]:
-        """List all applications."""
-        applications = list(self.index["applications"].values())
-        
+        """List all applications, most recently updated first."""
         if status_filter:
-            applications = [a for a in applications if a["status"] == status_filter.value]
-        
-        # Sort by updated_at descending
-        applications.sort(key=lambda a: a.get("updated_at", ""), reverse=True)
+            rows = self.conn.execute(
+                f"SELECT {_SUMMARY_COLUMNS} FROM applications WHERE status = ? ORDER BY updated_at DESC",
+                (status_filter.value,),
+            )
+        else:
+            rows = self.conn.execute(
+                f"SELECT {_SUMMARY_COLUMNS} FROM applications ORDER BY updated_at DESC"
+            )
         
-        return applications
+        return [dict(row) for row in rows]
     
     def get_stats(self) -> dict:
         """Get application statistics."""
-        apps = self.index["applications"].values()
+        counts = dict(self.conn.execute(
+            "SELECT status, COUNT(*) FROM applications GROUP BY status"
+        ).fetchall())
         
-        stats = {
-            "total": len(apps),
-            "by_status": {},
+        return {
+            "total": sum(counts.values()),
+            # Keep the workflow order of ApplicationStatus
+            "by_status": {s.value: counts[s.value] for s in ApplicationStatus if s.value in counts},
         }
-        
-        for status in ApplicationStatus:
-            count = sum(1 for a in apps if a["status"] == status.value)
-            if count > 0:
-                stats["by_status"][status.value] = count
-        
-        return stats
     
     def delete(self, app_id: str) -> bool:
         """Delete an application."""
-        if app_id not in self.index["applications"]:
-            return False
-        
-        # Remove from index
-        del self.index["applications"][app_id]
-        self._save_index()
-        
-        # Remove file
-        app_path = self.data_dir / f"{app_id}.json"
-        if app_path.exists():
-            app_path.unlink()
+        with self.batch():
+            deleted = self.conn.execute(
+                "DELETE FROM applications WHERE id = ?", (app_id,)
+            ).rowcount
+            self.conn.execute("DELETE FROM events WHERE app_id = ?", (app_id,))
+            if self._fts:
+                self.conn.execute("DELETE FROM applications_fts WHERE app_id = ?", (app_id,))
         
-        return True
+        self._cache.pop(app_id, None)
+        return deleted > 0
     
     def search(self, query: str) -> list[dict]:
         """Search applications by company or title."""
-        query = query.lower()
-        results = []
-        
-        for app in self.index["applications"].values():
-            if query in app["company"].lower() or query in app["title"].lower():
-                results.append(app)
+        if self._fts and len(query) >= _FTS_MIN_QUERY:
+            # A quoted trigram phrase matches the query as a case-insensitive substring
+            phrase = '"' + query.replace('"', '""') + '"'
+            rows = self.conn.execute(
+                f"SELECT {_SUMMARY_COLUMNS} FROM applications WHERE id IN "
+                "(SELECT app_id FROM applications_fts WHERE applications_fts MATCH ?) "
+                "ORDER BY created_at",
+                (phrase,),
+            )
+        else:
+            rows = self.conn.execute(
+                f"SELECT {_SUMMARY_COLUMNS} FROM applications "
+                "WHERE instr(casefold(company), ?) OR instr(casefold(title), ?) "
+                "ORDER BY created_at",
+                (query.casefold(), query.casefold()),
+            )
         
-        return results
+        return [dict(row) for row in rows]
@@ -0,0 +1,40 @@
+"""Regression checks for job description normalization."""
+
+import unittest
+
+from jobhunter.matcher import _normalize_description
+
+
+class NormalizeDescriptionTest(unittest.TestCase):
+    
+    def test_keeps_list_items_before_eeo_statement(self):
+        description = (
+            "<h3>Requirements</h3><ul><li>5+ years backend</li><li>Go or Java</li></ul>"
+            "<p>Stripe is an equal opportunity employer.</p>"
+        )
+        self.assertEqual(
+            _normalize_description(description),
+            "Requirements\n5+ years backend\nGo or Java",
+        )
+    
+    def test_escaped_greenhouse_content(self):
+        description = (
+            "&lt;ul&gt;&lt;li&gt;Design APIs&lt;/li&gt;&lt;/ul&gt;"
+            "&lt;p&gt;We provide reasonable accommodations on request.&lt;/p&gt;"
+        )
+        self.assertEqual(_normalize_description(description), "Design APIs")
+    
+    def test_drops_only_the_boilerplate_line(self):
+        description = (
+            "• Build APIs\n• Own services\n"
+            "We welcome applicants regardless of sexual orientation or gender identity"
+        )
+        self.assertEqual(_normalize_description(description), "Build APIs\nOwn services")
+    
+    def test_drops_only_the_boilerplate_sentence(self):
+        description = "We ship fast. We are an equal opportunity employer. You will love it."
+        self.assertEqual(_normalize_description(description), "We ship fast. You will love it.")
+
+
+if __name__ == "__main__":
+    unittest.main()